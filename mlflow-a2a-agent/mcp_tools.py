@@ -5,179 +5,951 @@ Creates ClientTool wrappers for MCP servers defined in MCP_SERVERS_JSON.
 Supports environment variable substitution in headers for secure token injection.
 """
 import os
+import sys
+import copy
 import json
 import re
+import time
+import atexit
+import random
+import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional
-from functools import partial
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from functools import lru_cache, partial
+from dataclasses import dataclass
 
 import httpx
 from typing import List, Dict, Any
 
+# orjson is much faster than stdlib json for the multi-KB payloads MCP
+# tools exchange; fall back to stdlib if it isn't installed.
+try:
+    import orjson
+
+    def _json_loads(data: Any) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    orjson = None
+
+    def _json_loads(data: Any) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# ijson enables incremental parsing of large tools/call responses
+# without materializing the whole parsed dict; optional.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 logger = logging.getLogger(__name__)
 
+# tools/call responses at least this large are parsed incrementally
+_STREAM_THRESHOLD_BYTES = 64 * 1024
+
+# Persistent HTTP clients shared by all MCP calls, one per event loop.
+# Reusing a pooled client avoids paying TCP + TLS handshake and DNS
+# lookup on every tools/list or tools/call round-trip. Keep-alive
+# connections belong to the loop that opened them, so the sync entry
+# points (each asyncio.run builds a fresh loop) must not reuse a
+# client created on an earlier, now-closed loop.
+_HTTPX_CLIENTS: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+_CLIENTS_GUARD = threading.Lock()
+
+_CLIENT_LIMITS = httpx.Limits(
+    max_connections=500,
+    max_keepalive_connections=100,
+    keepalive_expiry=30.0,
+)
+_CLIENT_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Transient transport errors are retried with exponential backoff +
+# jitter; the first attempt gets a short read budget so a stalled RTT
+# fails fast and is recovered by the retry instead of burning the full
+# timeout.
+_RETRY_BASE_DELAY = 0.2
+_FIRST_ATTEMPT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+
+def _rpc_retries() -> int:
+    """Number of retries after the first attempt (MCP_RPC_RETRIES, default 2)."""
+    try:
+        return int(os.getenv("MCP_RPC_RETRIES", "2"))
+    except ValueError:
+        return 2
+
+
+async def _backoff(attempt: int, exc: Exception) -> None:
+    """Sleep before retry attempt+1 with exponential backoff and jitter."""
+    delay = _RETRY_BASE_DELAY * (2 ** attempt) + random.random() * 0.1
+    logger.warning(f"Transient MCP transport error ({exc!r}); retrying in {delay:.2f}s")
+    await asyncio.sleep(delay)
+
+
+async def _post_with_retries(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    content: bytes,
+    headers: Dict[str, str],
+    timeout: Any,
+    retry_read_timeout: bool = False
+) -> httpx.Response:
+    """
+    POST with bounded retries on transient transport errors.
+
+    Connect errors are always retried (nothing reached the server).
+    Read timeouts are retried only when the caller says the request is
+    idempotent (tools/list, initialize) — and only then is the first
+    attempt given the shortened fail-fast timeout.
+    """
+    retries = _rpc_retries()
+    for attempt in range(retries + 1):
+        attempt_timeout = (
+            _FIRST_ATTEMPT_TIMEOUT
+            if retry_read_timeout and attempt < retries
+            else timeout
+        )
+        try:
+            return await client.post(
+                url, content=content, headers=headers, timeout=attempt_timeout
+            )
+        except httpx.ConnectError as e:
+            if attempt >= retries:
+                raise
+            await _backoff(attempt, e)
+        except httpx.ReadTimeout as e:
+            if not retry_read_timeout or attempt >= retries:
+                raise
+            await _backoff(attempt, e)
+
+
+async def _get_client() -> httpx.AsyncClient:
+    """Lazily create the shared AsyncClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _HTTPX_CLIENTS.get(loop)
+    if client is None:
+        with _CLIENTS_GUARD:
+            client = _HTTPX_CLIENTS.get(loop)
+            if client is None:
+                # Drop entries for loops that have since closed; their
+                # connections died with the loop
+                for stale in [l for l in _HTTPX_CLIENTS if l.is_closed()]:
+                    del _HTTPX_CLIENTS[stale]
+                try:
+                    # HTTP/2 lets concurrent tool calls to the same MCP
+                    # gateway multiplex over one TCP+TLS connection
+                    client = httpx.AsyncClient(
+                        http2=True,
+                        limits=_CLIENT_LIMITS,
+                        timeout=_CLIENT_TIMEOUT,
+                    )
+                    logger.info("Created persistent MCP HTTP client (HTTP/2 enabled)")
+                except ImportError:
+                    # h2 not installed (httpx[http2]); HTTP/1.1 keepalive still applies
+                    client = httpx.AsyncClient(
+                        limits=_CLIENT_LIMITS,
+                        timeout=_CLIENT_TIMEOUT,
+                    )
+                    logger.info("Created persistent MCP HTTP client (HTTP/1.1)")
+                _HTTPX_CLIENTS[loop] = client
+    return client
+
+
+class MCPSessionPool:
+    """
+    Pool of MCP sessions keyed by server URL.
+
+    Servers speaking the streamable HTTP transport hand out an
+    Mcp-Session-Id on initialize; reusing it across tools/call
+    invocations avoids re-running the initialize handshake per call.
+    Sessions expire after session_ttl seconds and are re-initialized
+    lazily. Servers that don't support initialize are remembered as
+    session-less so they aren't re-probed on every call.
+    """
+
+    def __init__(self, session_ttl: float = 300.0):
+        self.session_ttl = session_ttl
+        # (url, headers-tuple) -> (session_id or None, created_at, headers)
+        self._sessions: Dict[
+            Tuple[str, Tuple[Tuple[str, str], ...]],
+            Tuple[Optional[str], float, Dict[str, str]],
+        ] = {}
+        # asyncio.Lock binds to the loop that first awaits it, so locks
+        # are scoped per running loop (like the shared client) under a
+        # plain threading.Lock guard
+        self._locks: Dict[Tuple[Any, ...], asyncio.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key: Tuple[Any, ...]) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self._locks_guard:
+            for stale in [k for k in self._locks if k[0].is_closed()]:
+                del self._locks[stale]
+            return self._locks.setdefault((loop, key), asyncio.Lock())
+
+    async def acquire(self, url: str, headers: Dict[str, str]) -> Optional[str]:
+        """Return a live session id for this URL + identity, initializing if needed."""
+        # Configs can share a gateway URL with different auth headers;
+        # those are distinct identities and must not share a session
+        key = (url, tuple(sorted(headers.items())))
+        lock = self._lock_for(key)
+        async with lock:
+            entry = self._sessions.get(key)
+            if entry is not None and time.time() - entry[1] < self.session_ttl:
+                return entry[0]
+            session_id = await self._initialize(url, headers)
+            self._sessions[key] = (session_id, time.time(), dict(headers))
+            return session_id
+
+    async def _initialize(self, url: str, headers: Dict[str, str]) -> Optional[str]:
+        """Run the MCP initialize handshake; None if the server has no sessions."""
+        try:
+            client = await _get_client()
+            response = await _post_with_retries(
+                client,
+                url,
+                content=_json_dumps({
+                    "jsonrpc": "2.0",
+                    "method": "initialize",
+                    "params": {
+                        "protocolVersion": "2024-11-05",
+                        "capabilities": {},
+                        "clientInfo": {"name": "mlflow-a2a-agent", "version": "1.0"},
+                    },
+                    "id": 1
+                }),
+                headers={"content-type": "application/json", **headers},
+                timeout=30.0,
+                retry_read_timeout=True
+            )
+            response.raise_for_status()
+            session_id = response.headers.get("mcp-session-id")
+            if session_id:
+                # Complete the handshake so the server marks the session ready
+                await client.post(
+                    url,
+                    content=_json_dumps({
+                        "jsonrpc": "2.0",
+                        "method": "notifications/initialized"
+                    }),
+                    headers={
+                        "content-type": "application/json",
+                        "mcp-session-id": session_id,
+                        **headers,
+                    },
+                    timeout=30.0
+                )
+                logger.info(f"Initialized MCP session for {url}")
+            return session_id
+        except Exception as e:
+            logger.debug(f"No MCP session for {url} (stateless server?): {e}")
+            return None
+
+    def invalidate(self, url: str) -> None:
+        """Drop cached sessions for this URL so the next call re-initializes."""
+        for key in [k for k in self._sessions if k[0] == url]:
+            del self._sessions[key]
+
+    async def close_all(self) -> None:
+        """Terminate all live sessions (best effort)."""
+        sessions, self._sessions = self._sessions, {}
+        for (url, _), (session_id, _, headers) in sessions.items():
+            if session_id is None:
+                continue
+            try:
+                client = await _get_client()
+                # The server's auth headers are required for it to
+                # accept the termination
+                await client.delete(
+                    url,
+                    headers={**headers, "mcp-session-id": session_id},
+                    timeout=10.0,
+                )
+            except Exception:
+                pass
+
+
+_SESSION_POOL = MCPSessionPool()
+
+
+async def _session_headers(url: str, headers: Dict[str, str]) -> Dict[str, str]:
+    """Headers for an RPC to this URL, carrying its pooled session id if any."""
+    session_id = await _SESSION_POOL.acquire(url, headers)
+    if session_id:
+        return {**headers, "mcp-session-id": session_id}
+    return headers
+
+
+def _close_client() -> None:
+    """Close sessions and any remaining clients at process exit."""
+    try:
+        asyncio.run(_SESSION_POOL.close_all())
+    except Exception:
+        pass
+    for loop in list(_HTTPX_CLIENTS):
+        client = _HTTPX_CLIENTS.pop(loop, None)
+        if client is not None:
+            try:
+                asyncio.run(client.aclose())
+            except Exception:
+                pass
+
+
+atexit.register(_close_client)
+
+
+async def _close_loop_client() -> None:
+    """Close the running loop's client (the loop is about to go away)."""
+    client = _HTTPX_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _run_sync(coro):
+    """
+    Run a coroutine from synchronous code.
+
+    Only valid when no event loop is running — calling the blocking
+    path from a coroutine would stall the loop for the whole HTTP
+    round-trip (up to 60s), so that's rejected with a pointer to the
+    async variant. Each call runs on a fresh asyncio.run loop, so the
+    loop's pooled client is closed before the loop is torn down rather
+    than leaking dead keep-alive connections into the client registry.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError(
+            "sync MCP call invoked from a running event loop; "
+            "use the *_async variant (e.g. MCPClientTool.async_run) instead"
+        )
+
+    async def _drive():
+        try:
+            return await coro
+        finally:
+            await _close_loop_client()
+
+    return asyncio.run(_drive())
+
+
+@dataclass(frozen=True, slots=True)
+class ToolDef:
+    """
+    Immutable definition of a discovered MCP tool.
+
+    Raw tools/list entries are converted to this at ingestion: a
+    slotted dataclass is far lighter than a per-tool dict when a
+    gateway registers hundreds of tools, and frozen instances can be
+    shared freely between the discovery cache and client tools.
+    """
+    name: str
+    description: str
+    parameters: Dict[str, Any]
+
+
+def _tool_def_from_raw(raw: Dict[str, Any]) -> ToolDef:
+    """Build a ToolDef from a raw tools/list entry."""
+    # intern names/descriptions: similar tools across namespaced
+    # configs repeat the same strings
+    return ToolDef(
+        name=sys.intern(raw.get("name", "")),
+        description=sys.intern(raw.get("description") or "MCP tool"),
+        parameters=raw.get("inputSchema", {}),
+    )
+
+
+# Tool discovery results are cached on disk so restarts skip the
+# tools/list network round-trip while the cache entry is fresh.
+def _discovery_ttl() -> float:
+    """Discovery cache TTL in seconds (MCP_DISCOVERY_TTL, default 1800)."""
+    try:
+        return float(os.getenv("MCP_DISCOVERY_TTL", "1800"))
+    except ValueError:
+        return 1800.0
+
+
+def _discovery_cache_disabled() -> bool:
+    return os.getenv("MCP_DISCOVERY_CACHE_DISABLE", "").lower() in ("1", "true", "yes")
+
+
+def _discovery_cache_path(server_config: Dict[str, Any]) -> Path:
+    """Cache file path for a server config, keyed by its SHA-256 hash."""
+    config_hash = hashlib.sha256(
+        json.dumps(server_config, sort_keys=True).encode()
+    ).hexdigest()
+    cache_root = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache_root / "mlflow-a2a-agent" / "mcp-tools" / f"{config_hash}.json"
+
+
+def _read_discovery_cache(server_config: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Return cached tools for this config if fresh, else None."""
+    if _discovery_cache_disabled():
+        return None
+    cache_path = _discovery_cache_path(server_config)
+    try:
+        with open(cache_path) as f:
+            entry = json.load(f)
+        if time.time() - entry["fetched_at"] < _discovery_ttl():
+            logger.info(
+                f"Using cached tool discovery for {server_config.get('name', 'unknown')} "
+                f"({len(entry['tools'])} tools)"
+            )
+            return entry["tools"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Failed to read discovery cache {cache_path}: {e}")
+    return None
+
+
+def _write_discovery_cache(server_config: Dict[str, Any], tools: List[Dict[str, Any]]) -> None:
+    """Persist discovered tools for this config."""
+    if _discovery_cache_disabled():
+        return
+    cache_path = _discovery_cache_path(server_config)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump({"fetched_at": time.time(), "tools": tools}, f)
+    except Exception as e:
+        logger.warning(f"Failed to write discovery cache {cache_path}: {e}")
+
+
+# Compiled once; substitute_env_vars runs per header per request.
+_ENV_VAR_RE = re.compile(r'\$\{(\w+)\}')
+
 
 def substitute_env_vars(value: str) -> str:
     """Replace ${VAR_NAME} with environment variable values."""
     def replace(match):
         var_name = match.group(1)
         return os.getenv(var_name, "")
-    return re.sub(r'\$\{(\w+)\}', replace, value)
+    return _ENV_VAR_RE.sub(replace, value)
+
+
+@lru_cache(maxsize=256)
+def _resolved_headers(frozen_headers) -> Dict[str, str]:
+    """
+    Substitute env vars in a headers dict, memoized.
+
+    Env vars are process-lifetime constants in this codebase, so the
+    substitution for a given header set only needs to happen once.
+    Takes the headers as a sorted tuple of (key, value) pairs so the
+    result is cacheable.
+    """
+    return {k: substitute_env_vars(v) for k, v in frozen_headers}
+
+
+def _resolve_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Resolve env vars in headers via the memoized cache."""
+    return _resolved_headers(tuple(sorted(headers.items())))
 
 
-def load_mcp_config() -> List[Dict[str, Any]]:
-    """Load MCP server configuration with environment variable substitution."""
-    config_str = os.getenv("MCP_SERVERS_JSON", "[]")
-    
+@lru_cache(maxsize=1)
+def _load_mcp_config_cached(config_str: str) -> Tuple[Dict[str, Any], ...]:
+    """Parse and env-substitute a raw MCP_SERVERS_JSON string, memoized."""
     # Substitute environment variables in the entire JSON string
     config_str = substitute_env_vars(config_str)
-    
+
     try:
-        config = json.loads(config_str)
-        logger.info(f"Loaded {len(config)} MCP server configurations")
-        return config
+        config = _json_loads(config_str)
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse MCP_SERVERS_JSON: {e}")
-        return []
+        return ()
+
+    # Resolve headers here, once — env vars don't change mid-process,
+    # so the RPC paths can use them as-is without re-substituting
+    for server_config in config:
+        headers = server_config.get("headers")
+        if headers:
+            server_config["headers"] = {
+                k: substitute_env_vars(v) for k, v in headers.items()
+            }
+
+    logger.info(f"Loaded {len(config)} MCP server configurations")
+    return tuple(config)
+
+
+def load_mcp_config() -> Tuple[Dict[str, Any], ...]:
+    """
+    Load MCP server configuration with environment variable substitution.
+
+    The parse is keyed on the raw MCP_SERVERS_JSON value, so repeated
+    calls (e.g. per-request tool refresh) skip the parse and env
+    substitution after the first; a changed env value naturally
+    produces a fresh parse. Returns a deep copy so mutating a returned
+    config can't poison the cached state for later callers.
+    """
+    return copy.deepcopy(_load_mcp_config_cached(os.getenv("MCP_SERVERS_JSON", "[]")))
 
 
-def discover_mcp_tools(server_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+async def discover_mcp_tools_async(
+    server_config: Dict[str, Any],
+    whitelist: Optional[Set[str]] = None
+) -> List[ToolDef]:
     """
     Discover available tools from an MCP server.
-    
-    Calls the tools/list method to get tool definitions.
+
+    Calls the tools/list method to get tool definitions, returned as
+    ToolDef instances. If a whitelist is given, non-whitelisted tools
+    are dropped here, before any per-tool metadata processing (or
+    caching) happens downstream.
     """
+    cached = _read_discovery_cache(server_config)
+    if cached is not None:
+        return [_tool_def_from_raw(t) for t in cached]
+
     url = server_config["url"]
+    # Headers were env-substituted once in load_mcp_config
     headers = server_config.get("headers", {})
-    
-    # Substitute env vars in headers
-    headers = {k: substitute_env_vars(v) for k, v in headers.items()}
-    
+
     try:
-        # MCP tools/list request
-        response = httpx.post(
+        client = await _get_client()
+        headers = await _session_headers(url, headers)
+        # MCP tools/list request (idempotent, so read timeouts retry too)
+        response = await _post_with_retries(
+            client,
             url,
-            json={
+            content=_json_dumps({
                 "jsonrpc": "2.0",
                 "method": "tools/list",
                 "id": 1
-            },
-            headers=headers,
-            timeout=30.0
+            }),
+            headers={"content-type": "application/json", **headers},
+            timeout=30.0,
+            retry_read_timeout=True
         )
         response.raise_for_status()
-        result = response.json()
-        
+        result = _json_loads(response.content)
+
         if "result" in result and "tools" in result["result"]:
             tools = result["result"]["tools"]
             logger.info(f"Discovered {len(tools)} tools from {server_config['name']}")
-            return tools
+            if whitelist:
+                tools = [t for t in tools if t.get("name") in whitelist]
+                logger.debug(
+                    f"{len(tools)}/{len(whitelist)} whitelisted tools matched "
+                    f"on {server_config['name']}"
+                )
+            _write_discovery_cache(server_config, tools)
+            return [_tool_def_from_raw(t) for t in tools]
         else:
             logger.warning(f"No tools found in response from {server_config['name']}")
             return []
-            
+
     except Exception as e:
         logger.error(f"Failed to discover tools from {server_config['name']}: {e}")
         return []
 
 
-def call_mcp_tool(
+def discover_mcp_tools(
+    server_config: Dict[str, Any],
+    whitelist: Optional[Set[str]] = None
+) -> List[ToolDef]:
+    """Synchronous wrapper around discover_mcp_tools_async."""
+    return _run_sync(discover_mcp_tools_async(server_config, whitelist))
+
+
+async def call_mcp_tool_async(
     server_config: Dict[str, Any],
     tool_name: str,
-    arguments: Dict[str, Any]
+    arguments: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None
 ) -> Any:
     """
     Call an MCP tool and return the result.
+
+    Headers were already env-substituted when the config was loaded.
     """
     url = server_config["url"]
-    headers = server_config.get("headers", {})
-    
-    # Substitute env vars in headers
-    headers = {k: substitute_env_vars(v) for k, v in headers.items()}
-    
+    if headers is None:
+        headers = server_config.get("headers", {})
+
     try:
-        response = httpx.post(
-            url,
-            json={
-                "jsonrpc": "2.0",
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments
-                },
-                "id": 1
+        client = await _get_client()
+        headers = await _session_headers(url, headers)
+        payload = _json_dumps({
+            "jsonrpc": "2.0",
+            "method": "tools/call",
+            "params": {
+                "name": tool_name,
+                "arguments": arguments
             },
-            headers=headers,
-            timeout=60.0
-        )
-        response.raise_for_status()
-        result = response.json()
-        
-        if "result" in result:
-            content = result["result"].get("content", [])
-            # Extract text content from MCP response
-            if isinstance(content, list):
-                texts = [c.get("text", str(c)) for c in content if isinstance(c, dict)]
-                return "\n".join(texts) if texts else str(content)
-            return str(content)
-        elif "error" in result:
-            return f"Error: {result['error'].get('message', 'Unknown error')}"
-        else:
-            return str(result)
-            
+            "id": 1
+        })
+        retries = _rpc_retries()
+        for attempt in range(retries + 1):
+            try:
+                async with client.stream(
+                    "POST",
+                    url,
+                    content=payload,
+                    headers={"content-type": "application/json", **headers},
+                    timeout=60.0
+                ) as response:
+                    response.raise_for_status()
+
+                    if _should_stream_parse(response):
+                        return await _parse_call_response_streaming(response)
+
+                    result = _json_loads(await response.aread())
+                    return _extract_tool_result(result)
+            except httpx.ConnectError as e:
+                # tools/call isn't idempotent — retry only when the
+                # request never reached the server
+                if attempt >= retries:
+                    raise
+                await _backoff(attempt, e)
+
     except Exception as e:
         logger.error(f"Failed to call MCP tool {tool_name}: {e}")
         return f"Error calling tool: {e}"
 
 
-def create_mcp_tool_dict(server_config: Dict[str, Any], tool_def: Dict[str, Any]) -> Dict[str, Any]:
+def _should_stream_parse(response: httpx.Response) -> bool:
+    """Incrementally parse only large responses (and only if ijson is there)."""
+    if ijson is None:
+        return False
+    try:
+        return int(response.headers.get("content-length", 0)) >= _STREAM_THRESHOLD_BYTES
+    except ValueError:
+        return False
+
+
+def _extract_tool_result(result: Dict[str, Any]) -> Any:
+    """Extract text content from a fully-parsed tools/call response."""
+    if "result" in result:
+        content = result["result"].get("content", [])
+        # Extract text content from MCP response
+        if isinstance(content, list):
+            # Hot path: the overwhelmingly common response is a single
+            # text block — return it directly, skipping list build + join
+            if len(content) == 1 and isinstance(content[0], dict):
+                # Fall back to the repr only when the key is missing —
+                # an empty text block legitimately yields ""
+                return content[0].get("text", str(content[0]))
+            texts = [c.get("text", str(c)) for c in content if isinstance(c, dict)]
+            return "\n".join(texts) if texts else str(content)
+        return str(content)
+    elif "error" in result:
+        return f"Error: {result['error'].get('message', 'Unknown error')}"
+    else:
+        return str(result)
+
+
+def _sink(into: List[Any]):
+    """Primed generator collecting parsed items for ijson.items_coro."""
+    while True:
+        into.append((yield))
+
+
+async def _parse_call_response_streaming(response: httpx.Response) -> Any:
+    """
+    Extract content[*].text from a large tools/call response incrementally.
+
+    Feeds the response bytes through ijson so the common text-block
+    case never materializes the entire parsed dict, only the text
+    fields. The raw bytes are kept so responses with no text blocks
+    (error objects, image/resource content, unexpected shapes) can
+    fall back to the buffered parser and produce the same output as
+    the non-streaming path.
+    """
+    texts: List[str] = []
+    chunks: List[bytes] = []
+    text_sink = _sink(texts)
+    next(text_sink)
+    text_coro = ijson.items_coro(text_sink, "result.content.item.text")
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk)
+        text_coro.send(chunk)
+    text_coro.close()
+
+    if texts:
+        return "\n".join(texts)
+    return _extract_tool_result(_json_loads(b"".join(chunks)))
+
+
+def call_mcp_tool(
+    server_config: Dict[str, Any],
+    tool_name: str,
+    arguments: Dict[str, Any]
+) -> Any:
+    """Synchronous wrapper around call_mcp_tool_async."""
+    return _run_sync(call_mcp_tool_async(server_config, tool_name, arguments))
+
+
+def create_mcp_tool_dict(
+    server_config: Dict[str, Any],
+    tool_def: Union[ToolDef, Dict[str, Any]]
+) -> Dict[str, Any]:
     """
     Create a tool definition dictionary for Llama Stack.
-    
+
     Returns a tool in the format expected by Llama Stack agents API.
+    Accepts either a ToolDef or a raw tools/list entry.
     """
-    tool_name = f"{server_config['name']}_{tool_def.get('name', '')}"
-    
+    if isinstance(tool_def, dict):
+        tool_def = _tool_def_from_raw(tool_def)
+    tool_name = f"{server_config['name']}_{tool_def.name}"
+
     return {
         "type": "function",
         "function": {
             "name": tool_name,
-            "description": tool_def.get("description", "MCP tool"),
-            "parameters": tool_def.get("inputSchema", {})
+            "description": tool_def.description,
+            "parameters": tool_def.parameters
         }
     }
 
 
-def create_mcp_client_tools() -> List[Dict[str, Any]]:
+class MCPClientTool:
     """
-    Create tool definitions for each MCP server/tool combination.
-    
-    Returns a list of tool dictionaries for Llama Stack.
+    ClientTool wrapper around a single tool on an MCP server.
+
+    Holds the server config + tool definition and exposes sync (run)
+    and async (async_run) invocation paths.
+
+    Gateways can register hundreds of tools, so instances are slotted:
+    no per-instance __dict__, roughly half the memory, and faster
+    attribute access on the invocation path.
     """
-    tools: List[Dict[str, Any]] = []
-    
-    for server_config in load_mcp_config():
+
+    __slots__ = (
+        "server_config",
+        "tool_definition",
+        "name",
+        "description",
+        "parameters",
+        "_resolved_headers",
+        "_tool_definition_cached",
+        "_call",
+    )
+
+    def __init__(
+        self,
+        server_config: Dict[str, Any],
+        tool_def: Union[ToolDef, Dict[str, Any]]
+    ):
+        if isinstance(tool_def, dict):
+            tool_def = _tool_def_from_raw(tool_def)
+        self.server_config = server_config
+        self.tool_definition = tool_def
+        # Resolve env vars in headers once; they don't change mid-process.
+        self._resolved_headers = _resolve_headers(server_config.get("headers", {}))
+        # Definitions are immutable after construction, so build the
+        # OpenAI-format dict once instead of per prompt assembly.
+        self.name = sys.intern(f"{server_config['name']}_{tool_def.name}")
+        self.description = tool_def.description
+        self.parameters = tool_def.parameters
+        self._tool_definition_cached = {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": self.parameters,
+            },
+        }
+        # Bind server config, tool name and headers once so invocation
+        # is a single call with no per-invocation dict lookups
+        self._call = partial(
+            call_mcp_tool_async,
+            server_config,
+            tool_def.name,
+            headers=self._resolved_headers,
+        )
+
+    def get_tool_definition(self) -> Dict[str, Any]:
+        """Return the tool definition in OpenAI function-calling format."""
+        return self._tool_definition_cached
+
+    def run(self, arguments: Dict[str, Any]) -> Any:
+        """Call the tool synchronously (blocks on the HTTP round-trip)."""
+        return _run_sync(self.async_run(arguments))
+
+    async def async_run(self, arguments: Dict[str, Any]) -> Any:
+        """Call the tool on the event loop without blocking it."""
+        if isinstance(arguments, str):
+            # Agent frameworks often hand over arguments as a JSON string
+            arguments = _json_loads(arguments)
+        return await self._call(arguments)
+
+
+async def _discover_batch_async(
+    configs: List[Dict[str, Any]]
+) -> List[List[ToolDef]]:
+    """
+    Discover tools for several configs sharing one URL in a single
+    JSON-RPC batch request.
+
+    Gateways often host namespaced tool sets behind one endpoint; the
+    HTTP transport permits array-of-requests batching, so N configs
+    cost one round-trip instead of N. Results are matched back to
+    configs by request id, whitelist-filtered and cached per config.
+    """
+    tool_lists: List[List[ToolDef]] = [[] for _ in configs]
+    pending: List[int] = []
+    for i, config in enumerate(configs):
+        cached = _read_discovery_cache(config)
+        if cached is not None:
+            tool_lists[i] = [_tool_def_from_raw(t) for t in cached]
+        else:
+            pending.append(i)
+    if not pending:
+        return tool_lists
+
+    url = configs[0]["url"]
+    headers = configs[0].get("headers", {})
+
+    remaining = list(pending)
+    try:
+        client = await _get_client()
+        headers = await _session_headers(url, headers)
+        response = await _post_with_retries(
+            client,
+            url,
+            content=_json_dumps([
+                {"jsonrpc": "2.0", "method": "tools/list", "id": i + 1}
+                for i in pending
+            ]),
+            headers={"content-type": "application/json", **headers},
+            timeout=30.0,
+            retry_read_timeout=True
+        )
+        response.raise_for_status()
+        entries = _json_loads(response.content)
+        if isinstance(entries, dict):
+            # Server doesn't batch; it answered with a single response
+            entries = [entries]
+        by_id = {e.get("id"): e for e in entries if isinstance(e, dict)}
+
+        matched = []
+        for i in pending:
+            config = configs[i]
+            entry = by_id.get(i + 1, {})
+            if "result" in entry and "tools" in entry["result"]:
+                tools = entry["result"]["tools"]
+                logger.info(f"Discovered {len(tools)} tools from {config['name']}")
+                whitelist = set(config.get("tools", []))
+                if whitelist:
+                    tools = [t for t in tools if t.get("name") in whitelist]
+                _write_discovery_cache(config, tools)
+                tool_lists[i] = [_tool_def_from_raw(t) for t in tools]
+                matched.append(i)
+        remaining = [i for i in pending if i not in matched]
+
+    except Exception as e:
+        logger.warning(f"Batched tool discovery from {url} failed: {e}")
+
+    if remaining:
+        # Many servers reject JSON-RPC arrays outright (the 2025-06-18
+        # spec revision removed batching), or answer with ids we can't
+        # match — fall back to one request per config so a shared URL
+        # never discovers fewer tools than separate ones would
+        names = ", ".join(configs[i].get("name", "unknown") for i in remaining)
+        logger.info(f"Falling back to per-config discovery for: {names}")
+        results = await asyncio.gather(
+            *[
+                discover_mcp_tools_async(
+                    configs[i], set(configs[i].get("tools", [])) or None
+                )
+                for i in remaining
+            ],
+            return_exceptions=True,
+        )
+        for i, result in zip(remaining, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    f"Failed to discover tools from {configs[i].get('name', 'unknown')}: {result}"
+                )
+            else:
+                tool_lists[i] = result
+
+    return tool_lists
+
+
+async def _discover_all(configs: List[Dict[str, Any]]) -> List[List[ToolDef]]:
+    """
+    Discover tools from all servers concurrently.
+
+    Configs sharing the same URL + headers are coalesced into one
+    JSON-RPC batch request; the rest go out individually. One slow or
+    unreachable server no longer delays (or fails) the others: results
+    come back in config order, with exceptions mapped to empty tool
+    lists.
+    """
+    groups: Dict[Tuple[Any, ...], List[int]] = {}
+    for idx, config in enumerate(configs):
+        key = (
+            config.get("url"),
+            tuple(sorted(config.get("headers", {}).items())),
+        )
+        groups.setdefault(key, []).append(idx)
+
+    tasks = []
+    task_indices: List[List[int]] = []
+    for indices in groups.values():
+        if len(indices) == 1:
+            config = configs[indices[0]]
+            tasks.append(
+                discover_mcp_tools_async(
+                    config, set(config.get("tools", [])) or None
+                )
+            )
+        else:
+            tasks.append(_discover_batch_async([configs[i] for i in indices]))
+        task_indices.append(indices)
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    tool_lists: List[List[ToolDef]] = [[] for _ in configs]
+    for indices, result in zip(task_indices, results):
+        if isinstance(result, BaseException):
+            names = ", ".join(configs[i].get("name", "unknown") for i in indices)
+            logger.error(f"Failed to discover tools from {names}: {result}")
+        elif len(indices) == 1:
+            tool_lists[indices[0]] = result
+        else:
+            for i, tools in zip(indices, result):
+                tool_lists[i] = tools
+    return tool_lists
+
+
+def create_mcp_client_tools() -> List[MCPClientTool]:
+    """
+    Create an MCPClientTool for each MCP server/tool combination.
+
+    Returns a list of client tools; call get_tool_definition() on each
+    to get the dictionary format expected by Llama Stack.
+    """
+    tools: List[MCPClientTool] = []
+
+    configs = load_mcp_config()
+    tool_lists = _run_sync(_discover_all(configs)) if configs else []
+
+    for server_config, mcp_tools in zip(configs, tool_lists):
         server_name = server_config.get("name", "unknown")
-        tool_whitelist = server_config.get("tools", [])
-        
+
         logger.info(f"Processing MCP server: {server_name}")
-        
-        # Discover available tools
-        mcp_tools = discover_mcp_tools(server_config)
-        
+
+        # Whitelist filtering already happened inside discovery
         for tool_def in mcp_tools:
-            tool_name = tool_def.get("name", "")
-            
-            # Filter by whitelist if specified
-            if tool_whitelist and tool_name not in tool_whitelist:
-                logger.debug(f"Skipping tool {tool_name} (not in whitelist)")
-                continue
-            
-            # Create tool dictionary
-            tool_dict = create_mcp_tool_dict(server_config, tool_def)
-            tools.append(tool_dict)
-            logger.info(f"Registered tool: {tool_dict['function']['name']}")
-    
+            tool = MCPClientTool(server_config, tool_def)
+            tools.append(tool)
+            logger.info(f"Registered tool: {tool.name}")
+
     logger.info(f"Total MCP tools registered: {len(tools)}")
     return tools
 
@@ -185,7 +957,7 @@ def create_mcp_client_tools() -> List[Dict[str, Any]]:
 # For testing
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    
+
     # Test with sample config
     os.environ["MCP_SERVERS_JSON"] = json.dumps([
         {
@@ -194,7 +966,6 @@ if __name__ == "__main__":
             "tools": ["test_tool"]
         }
     ])
-    
+
     tools = create_mcp_client_tools()
     print(f"Created {len(tools)} tools")
-